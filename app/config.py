@@ -0,0 +1,39 @@
+# app/config.py
+"""
+Process-wide settings snapshot.
+
+Reads the environment once per process instead of scattering os.getenv
+calls through request handlers. Implemented as a frozen dataclass rather
+than pydantic-settings to avoid another dependency.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass(frozen=True)
+class Settings:
+    print_backend: str = "file"
+    archive_dir: str = "archives"
+    output_dir: str = "_out"
+    escpos_connection: str = "network"
+    escpos_host: str = "127.0.0.1"
+    escpos_port: str = "9100"
+    escpos_vendor_id: str = "0000"
+    escpos_product_id: str = "0000"
+    escpos_device: str = "/dev/ttyUSB0"
+    escpos_baudrate: str = "9600"
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        defaults = cls()
+        return cls(**{
+            name: os.getenv(name.upper(), getattr(defaults, name))
+            for name in defaults.__dataclass_fields__
+        })
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings.from_env()
@@ -1,18 +1,27 @@
-from fastapi import FastAPI, Request, Depends, Form, HTTPException
+from fastapi import FastAPI, Request, Depends, Form, HTTPException, BackgroundTasks
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.middleware.gzip import GZipMiddleware
+import jinja2
 
-from .deps import init_db, get_db
+from .config import get_settings
+from .deps import init_db, get_db, SessionLocal
 from .schemas import TicketCreate
 from .models import Ticket, Urgency
 from .printing import print_ticket
-from .storage import archive_paths, write_metadata, compute_hash
+from .storage import archive_paths, write_metadata, fast_copy, update_hash_from_file
 from .tags import get_preset_tags, save_preset_tags, validate_tag_config
-from sqlalchemy.orm import Session
-from datetime import datetime, date, timedelta
-from typing import Optional
+from sqlalchemy import false, insert
+from sqlalchemy.orm import Session, load_only
+from datetime import datetime, date, timedelta, timezone
+from typing import List, Optional
+import asyncio
+import functools
+import hashlib
 import os
+import time
+import uuid
 import shutil
 import logging
 
@@ -29,9 +38,26 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="ToDo Tickets Web")
 
+# Compress the larger HTML responses (/history, /admin) over the wire
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Static and templates
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
-templates = Jinja2Templates(directory="app/views")
+
+# Explicit Jinja2 environment: in production, skip the per-render stat()/
+# recompile cycle and persist compiled templates across restarts
+_dev_mode = os.getenv("ENV", "production").lower() in ("dev", "development")
+if _dev_mode:
+    templates = Jinja2Templates(directory="app/views")
+else:
+    os.makedirs(".jinja_cache", exist_ok=True)
+    templates = Jinja2Templates(env=jinja2.Environment(
+        loader=jinja2.FileSystemLoader("app/views"),
+        autoescape=jinja2.select_autoescape(["html"]),
+        auto_reload=False,
+        cache_size=400,
+        bytecode_cache=jinja2.FileSystemBytecodeCache(".jinja_cache"),
+    ))
 
 @app.on_event("startup")
 def _startup() -> None:
@@ -49,22 +75,25 @@ def create_form(request: Request):
 # Minimal create -> (later) render/print/archive
 def _resolve_due(due_quick: Optional[str], due_date_str: Optional[str]) -> Optional[str]:
     """Resolve quick due date options to actual ISO dates"""
+    # Keyed on today's ordinal so cached answers roll over at midnight
+    return _resolve_due_cached(due_quick, due_date_str, date.today().toordinal())
+
+@functools.lru_cache(maxsize=64)
+def _resolve_due_cached(due_quick: Optional[str], due_date_str: Optional[str], today_ordinal: int) -> Optional[str]:
     if due_quick == "custom" and due_date_str:
         return due_date_str
+    today = date.fromordinal(today_ordinal)
     if due_quick == "today":
-        return date.today().isoformat()
+        return today.isoformat()
     if due_quick == "this_week":
         # next Sunday (assuming Mon–Sun workweek; adjust if you prefer)
-        today = date.today()
         days = (6 - today.weekday()) % 7
         return (today + timedelta(days=days)).isoformat()
     if due_quick == "next_week":
-        today = date.today()
         # Monday of next week
         days = (7 - today.weekday()) % 7
         return (today + timedelta(days=days)).isoformat()
     if due_quick == "this_month":
-        today = date.today()
         # last day of month
         first_next = (date(today.year + (today.month==12), (today.month % 12)+1, 1))
         return (first_next - timedelta(days=1)).isoformat()
@@ -74,11 +103,20 @@ def _infer_title(title: Optional[str], body: str) -> str:
     """Infer title from first line of body if not provided"""
     if title and title.strip():
         return title.strip()
-    first = (body.splitlines()[0] if body else "").strip()
+    # Slice off the first line without splitting the whole body into a list
+    idx = body.find("\n") if body else -1
+    first = (body if idx < 0 else body[:idx]).strip() if body else ""
     if 0 < len(first) <= 50:
         return first
     return f"Ticket {datetime.now():%Y-%m-%d %H:%M}"
 
+def _parse_ticket_id(ticket_id: str) -> Optional[uuid.UUID]:
+    """Parse a ticket id path/form param (ids are stored as binary UUIDs)"""
+    try:
+        return uuid.UUID(ticket_id)
+    except (ValueError, AttributeError, TypeError):
+        return None
+
 def _map_urgency(u: str) -> Urgency:
     """Safely map urgency string to enum"""
     try:
@@ -87,8 +125,9 @@ def _map_urgency(u: str) -> Urgency:
         return Urgency.normal
 
 @app.post("/api/tickets")
-def create_ticket(
+async def create_ticket(
     request: Request,
+    background_tasks: BackgroundTasks,
     title: Optional[str] = Form(None),
     body: str = Form(...),
     urgency: str = Form("none"),
@@ -110,61 +149,82 @@ def create_ticket(
     resolved_due = _resolve_due(due_quick, due_date)
     final_title = _infer_title(title, body)
     
-    # Create ticket record
+    # Create ticket record (queued until the background print/archive finishes).
+    # The id and created_at are generated client-side so nothing downstream
+    # needs a refresh round-trip to read server-populated columns.
+    ticket_id = uuid.uuid4()
     ticket = Ticket(
+        id=ticket_id,
         title=final_title,
         body=body,
         urgency=_map_urgency(urgency),
         due_date=resolved_due,
+        status="queued",
+        created_at=datetime.utcnow(),
         archive_pdf_path="",
         archive_json_path="",
         hash="",
     )
+
+    # Render the print HTML via the shared Jinja2 environment - compiled once
+    # and cached, and auto-escapes the user-supplied title/body. Rendered
+    # before the commit so no attribute access reloads the row afterwards.
+    html_content = templates.env.get_template("ticket_print.html").render(ticket=ticket)
+
     db.add(ticket)
     db.commit()
-    db.refresh(ticket)  # Get the generated ID
-    
-    # Build HTML content for printing
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Ticket {ticket.id}</title>
-        <style>
-            body {{ font-family: monospace; font-size: 12px; }}
-            .header {{ text-align: center; font-weight: bold; }}
-            .urgency {{ text-transform: uppercase; }}
-        </style>
-    </head>
-    <body>
-        <div class="header">Ticket #{ticket.id}</div>
-        <h2>{ticket.title}</h2>
-        <p><strong>Urgency:</strong> <span class="urgency">{ticket.urgency.value}</span></p>
-        {f'<p><strong>Due:</strong> {ticket.due_date}</p>' if ticket.due_date else ''}
-        <p><strong>Created:</strong> {ticket.created_at.strftime('%Y-%m-%d %H:%M')}</p>
-        <hr>
-        <div>{ticket.body}</div>
-        <hr>
-        <p style="text-align: center;">toDoTickets</p>
-    </body>
-    </html>
+
+    # Print/archive runs after the response is sent - the browser gets its
+    # redirect as soon as the row is committed, not after the printer finishes
+    background_tasks.add_task(_finalize_ticket, ticket_id, html_content, urgency_plus, tag, due_mode)
+
+    return RedirectResponse(url="/", status_code=303)
+
+async def _finalize_ticket(ticket_id: uuid.UUID, html_content: str, urgency_plus: bool, tag: Optional[str], due_mode: str) -> None:
+    """Print and archive a queued ticket, then mark it printed/failed.
+
+    Runs as a background task after the create response has been sent, so it
+    opens its own DB session rather than reusing the request-scoped one. The
+    blocking stages run in worker threads; the independent metadata-write and
+    PDF-archive steps run concurrently.
+
+    No session (and therefore no pooled connection) is held while the printer
+    or PDF renderer runs: one short-lived session loads the ticket, a second
+    one commits the result.
     """
-    
+    db = SessionLocal()
+    try:
+        ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+        if not ticket:
+            logger.error(f"MAIN: Ticket {ticket_id} vanished before finalize")
+            return
+    finally:
+        db.close()  # ticket stays usable detached - all columns are loaded
+
     try:
         logger.info(f"MAIN: Starting print/archive process for ticket {ticket.id}")
-        
+
+        # Set up archive paths first so the file backend can write the
+        # PDF straight to its archive location (no copy afterwards)
+        archive_pdf_path, archive_json_path = archive_paths(str(ticket.id))
+        logger.info(f"MAIN: Archive paths - PDF: {archive_pdf_path}, JSON: {archive_json_path}")
+
         # Print the ticket
         logger.info(f"MAIN: Calling print_ticket for ticket {ticket.id}")
-        print_result = print_ticket(ticket, html_content, urgency_plus=urgency_plus, tag=tag, due_mode=due_mode)
+        print_result = await asyncio.to_thread(
+            print_ticket,
+            ticket, html_content, urgency_plus=urgency_plus, tag=tag,
+            due_mode=due_mode, output_pdf_path=archive_pdf_path,
+        )
         logger.info(f"MAIN: print_ticket returned: {print_result}")
-        
-        # Set up archive paths
-        archive_pdf_path, archive_json_path = archive_paths(ticket.id)
-        logger.info(f"MAIN: Archive paths - PDF: {archive_pdf_path}, JSON: {archive_json_path}")
-        
+
+        # One print timestamp for both the metadata and the DB row
+        # (datetime.utcnow is deprecated and was called twice here)
+        printed_at = datetime.now(timezone.utc)
+
         # Write metadata
         metadata = {
-            "id": ticket.id,
+            "id": str(ticket.id),
             "title": ticket.title,
             "body": ticket.body,
             "urgency": ticket.urgency.value,
@@ -173,54 +233,97 @@ def create_ticket(
             "due_date": ticket.due_date,
             "due_mode": due_mode,
             "created_at": ticket.created_at.isoformat(),
-            "printed_at": datetime.utcnow().isoformat(),
+            "printed_at": printed_at.isoformat(),
             "print_backend": print_result["backend"],
             "job_id": print_result["job_id"]
         }
-        logger.info(f"MAIN: Writing metadata for ticket {ticket.id}")
-        write_metadata(archive_json_path, metadata)
-        logger.info(f"MAIN: Metadata written successfully")
-        
-        # For file backend, copy PDF to archive location if needed
-        pdf_archived = False
-        if print_result["pdf_path"] and print_result["pdf_path"] != archive_pdf_path:
-            logger.info(f"MAIN: Copying PDF from {print_result['pdf_path']} to {archive_pdf_path}")
-            archive_pdf_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(print_result["pdf_path"], archive_pdf_path)
-            pdf_archived = True
-            logger.info("MAIN: PDF copied successfully")
-        elif print_result["pdf_path"] == archive_pdf_path:
-            pdf_archived = True
-            logger.info("MAIN: PDF already at archive location")
-        else:
-            logger.info("MAIN: No PDF to archive (ESC/POS backend or PDF generation failed)")
-        
-        # Compute hash and update ticket 
-        logger.info(f"MAIN: Computing hash for ticket {ticket.id}")
-        ticket_hash = compute_hash(archive_pdf_path if pdf_archived else None, archive_json_path)
-        ticket.archive_pdf_path = str(archive_pdf_path) if pdf_archived else ""
-        ticket.archive_json_path = str(archive_json_path)
-        ticket.hash = ticket_hash
-        ticket.printed_at = datetime.utcnow()
-        ticket.print_job_id = print_result["job_id"]
-        ticket.status = "printed"
-        
-        logger.info(f"MAIN: Updating ticket {ticket.id} with status 'printed'")
-        db.commit()
-        logger.info(f"MAIN: Ticket {ticket.id} processed successfully")
-        
+        # Archive the PDF (file backend) and hash it in the same pass -
+        # same digest as compute_hash (PDF bytes, then JSON bytes) but
+        # without a second read of files we just wrote
+        hasher = hashlib.sha256()
+
+        def _archive_pdf() -> bool:
+            if print_result["pdf_path"] and print_result["pdf_path"] != archive_pdf_path:
+                logger.info(f"MAIN: Copying PDF from {print_result['pdf_path']} to {archive_pdf_path}")
+                archive_pdf_path.parent.mkdir(parents=True, exist_ok=True)
+                fast_copy(print_result["pdf_path"], archive_pdf_path, hasher=hasher)
+                logger.info("MAIN: PDF copied successfully")
+                return True
+            elif print_result["pdf_path"] == archive_pdf_path:
+                update_hash_from_file(hasher, archive_pdf_path)
+                logger.info("MAIN: PDF already at archive location")
+                return True
+            else:
+                hasher.update(b"NO_PDF_GENERATED")
+                logger.info("MAIN: No PDF to archive (ESC/POS backend or PDF generation failed)")
+                return False
+
+        # The JSON write and the PDF archive touch different files, so run
+        # them concurrently; only the hasher's JSON contribution has to
+        # wait (PDF bytes must precede JSON bytes in the digest)
+        logger.info(f"MAIN: Writing metadata and archiving PDF for ticket {ticket.id}")
+        metadata_bytes, pdf_archived = await asyncio.gather(
+            asyncio.to_thread(write_metadata, archive_json_path, metadata),
+            asyncio.to_thread(_archive_pdf),
+        )
+
+        hasher.update(metadata_bytes)
+        updates = {
+            "archive_pdf_path": str(archive_pdf_path) if pdf_archived else "",
+            "archive_json_path": str(archive_json_path),
+            "hash": hasher.hexdigest(),
+            # DateTime columns hold naive UTC (matching created_at)
+            "printed_at": printed_at.replace(tzinfo=None),
+            "print_job_id": print_result["job_id"],
+            "status": "printed",
+        }
+
     except Exception as e:
         # If printing/archiving fails, mark ticket as failed but keep it
         logger.error(f"MAIN: Print/archive process failed for ticket {ticket.id}: {e}")
         logger.error(f"MAIN: Exception type: {type(e).__name__}")
         import traceback
         logger.error(f"MAIN: Full traceback: {traceback.format_exc()}")
-        
-        ticket.status = "failed"
+        updates = {"status": "failed"}
+
+    # Fresh session just for the final UPDATE
+    db = SessionLocal()
+    try:
+        db.query(Ticket).filter(Ticket.id == ticket_id).update(updates, synchronize_session=False)
         db.commit()
-        logger.info(f"MAIN: Ticket {ticket.id} marked as failed")
-        
-    return RedirectResponse(url="/", status_code=303)
+        logger.info(f"MAIN: Ticket {ticket_id} marked as '{updates['status']}'")
+    finally:
+        db.close()
+
+@app.post("/api/tickets/bulk")
+def bulk_create_tickets(payload: List[TicketCreate], db: Session = Depends(get_db)):
+    """Batch-insert tickets in one INSERT (for imports/API backfills).
+
+    Skips the per-row add+commit+refresh round-trip - SQLAlchemy 2.x turns
+    the parameter list into a single insertmanyvalues statement.
+    """
+    if not payload:
+        return {"success": False, "error": "No tickets provided"}
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "title": t.title,
+            "body": t.body,
+            "urgency": _map_urgency(t.urgency),
+            "due_date": t.due_date,
+            "status": "imported",
+            "created_at": now,
+            "archive_pdf_path": "",
+            "archive_json_path": "",
+            "hash": "",
+        }
+        for t in payload
+    ]
+    db.execute(insert(Ticket), rows)
+    db.commit()
+    return {"success": True, "message": f"Created {len(rows)} tickets"}
 
 @app.get("/history", response_class=HTMLResponse)
 def history(
@@ -234,9 +337,13 @@ def history(
     limit: int = 50,
     db: Session = Depends(get_db)
 ):
-    # Build query with filters
-    query = db.query(Ticket)
-    
+    # Build query with filters; only load the columns history.html renders
+    # (skips archive paths, hash, print_job_id and author per row)
+    query = db.query(Ticket).options(load_only(
+        Ticket.id, Ticket.title, Ticket.body, Ticket.urgency,
+        Ticket.due_date, Ticket.status, Ticket.created_at, Ticket.printed_at,
+    ))
+
     # Apply search filter
     if search:
         search_term = f"%{search}%"
@@ -249,9 +356,14 @@ def history(
     if status:
         query = query.filter(Ticket.status == status)
     
-    # Apply urgency filter
+    # Apply urgency filter - resolve the query param before it reaches the
+    # bind (UrgencyType raises on unknown strings); a hand-edited URL should
+    # match nothing, like the old VARCHAR filter did, not 500
     if urgency:
-        query = query.filter(Ticket.urgency == urgency)
+        try:
+            query = query.filter(Ticket.urgency == Urgency(urgency))
+        except ValueError:
+            query = query.filter(false())
     
     # Apply sorting
     if sort == "created_desc":
@@ -306,37 +418,17 @@ def history(
 def reprint_ticket(ticket_id: str, db: Session = Depends(get_db)):
     """Reprint an existing ticket"""
     try:
-        ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+        tid = _parse_ticket_id(ticket_id)
+        ticket = db.query(Ticket).filter(Ticket.id == tid).first() if tid else None
         if not ticket:
             return {"success": False, "error": "Ticket not found"}
         
-        # Build HTML content for reprinting
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Ticket {ticket.id}</title>
-            <style>
-                body {{ font-family: monospace; font-size: 12px; }}
-                .header {{ text-align: center; font-weight: bold; }}
-                .urgency {{ text-transform: uppercase; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">Ticket #{ticket.id} (REPRINT)</div>
-            <h2>{ticket.title}</h2>
-            <p><strong>Urgency:</strong> <span class="urgency">{ticket.urgency.value}</span></p>
-            {f'<p><strong>Due:</strong> {ticket.due_date}</p>' if ticket.due_date else ''}
-            <p><strong>Created:</strong> {ticket.created_at.strftime('%Y-%m-%d %H:%M')}</p>
-            <p><strong>Reprinted:</strong> {datetime.utcnow().strftime('%Y-%m-%d %H:%M')}</p>
-            <hr>
-            <div>{ticket.body}</div>
-            <hr>
-            <p style="text-align: center;">toDoTickets (REPRINT)</p>
-        </body>
-        </html>
-        """
-        
+        # Render the print HTML via the shared Jinja2 environment
+        html_content = templates.env.get_template("ticket_print.html").render(
+            ticket=ticket, reprint=True, reprinted_at=datetime.utcnow()
+        )
+
+
         # Print the ticket (reuse existing print logic)
         print_result = print_ticket(ticket, html_content, urgency_plus=False, tag=None, due_mode="NONE")
         
@@ -355,12 +447,16 @@ def bulk_delete_tickets(request: Request, ticket_ids: str = Form(...), db: Sessi
     try:
         import json
         ids_list = json.loads(ticket_ids)
-        
+
         if not ids_list:
             return {"success": False, "error": "No tickets selected"}
-        
+
+        parsed_ids = [tid for tid in map(_parse_ticket_id, ids_list) if tid]
+        if not parsed_ids:
+            return {"success": False, "error": "Invalid ticket IDs format"}
+
         # Delete tickets
-        deleted_count = db.query(Ticket).filter(Ticket.id.in_(ids_list)).delete(synchronize_session=False)
+        deleted_count = db.query(Ticket).filter(Ticket.id.in_(parsed_ids)).delete(synchronize_session=False)
         db.commit()
         
         return {"success": True, "message": f"Deleted {deleted_count} tickets"}
@@ -371,35 +467,25 @@ def bulk_delete_tickets(request: Request, ticket_ids: str = Form(...), db: Sessi
         logger.error(f"Error bulk deleting tickets: {e}")
         return {"success": False, "error": "Internal server error"}
 
-@app.get("/admin", response_class=HTMLResponse)
-def admin(request: Request):
-    # Get system information
-    print_backend = os.getenv("PRINT_BACKEND", "file")
-    archive_dir = os.getenv("ARCHIVE_DIR", "archives")
-    output_dir = os.getenv("OUTPUT_DIR", "_out")
-    
+def _compute_admin_data() -> dict:
+    # Get system information (env snapshot taken once per process)
+    s = get_settings()
+
     # Connection info for ESC/POS
     connection_info = None
-    if print_backend == "escpos":
-        conn_type = os.getenv("ESCPOS_CONNECTION", "network")
-        if conn_type == "network":
-            host = os.getenv("ESCPOS_HOST", "127.0.0.1")
-            port = os.getenv("ESCPOS_PORT", "9100")
-            connection_info = f"Network: {host}:{port}"
-        elif conn_type == "usb":
-            vid = os.getenv("ESCPOS_VENDOR_ID", "0000")
-            pid = os.getenv("ESCPOS_PRODUCT_ID", "0000")
-            connection_info = f"USB: VID={vid}, PID={pid}"
-        elif conn_type == "serial":
-            device = os.getenv("ESCPOS_DEVICE", "/dev/ttyUSB0")
-            baudrate = os.getenv("ESCPOS_BAUDRATE", "9600")
-            connection_info = f"Serial: {device} @ {baudrate} baud"
-    
+    if s.print_backend == "escpos":
+        if s.escpos_connection == "network":
+            connection_info = f"Network: {s.escpos_host}:{s.escpos_port}"
+        elif s.escpos_connection == "usb":
+            connection_info = f"USB: VID={s.escpos_vendor_id}, PID={s.escpos_product_id}"
+        elif s.escpos_connection == "serial":
+            connection_info = f"Serial: {s.escpos_device} @ {s.escpos_baudrate} baud"
+
     # Disk usage for archive directory
     disk_info = None
     try:
-        if os.path.exists(archive_dir):
-            total, used, free = shutil.disk_usage(archive_dir)
+        if os.path.exists(s.archive_dir):
+            total, used, free = shutil.disk_usage(s.archive_dir)
             disk_info = {
                 "total_gb": round(total / (1024**3), 2),
                 "used_gb": round(used / (1024**3), 2),
@@ -408,19 +494,32 @@ def admin(request: Request):
             }
     except Exception:
         pass
-    
-    # Get current preset tags
-    preset_tags = get_preset_tags()
-    
-    admin_data = {
-        "print_backend": print_backend,
-        "archive_dir": archive_dir,
-        "output_dir": output_dir,
+
+    return {
+        "print_backend": s.print_backend,
+        "archive_dir": s.archive_dir,
+        "output_dir": s.output_dir,
         "connection_info": connection_info,
         "disk_info": disk_info,
-        "preset_tags": preset_tags
     }
-    
+
+_ADMIN_TTL_SECONDS = 5.0
+_admin_cache = {"t": 0.0, "v": None}
+
+def _get_admin_data() -> dict:
+    """Env vars and disk usage change rarely - recompute at most every 5s"""
+    now = time.monotonic()
+    if _admin_cache["v"] is None or now - _admin_cache["t"] > _ADMIN_TTL_SECONDS:
+        _admin_cache["v"] = _compute_admin_data()
+        _admin_cache["t"] = now
+    return _admin_cache["v"]
+
+@app.get("/admin", response_class=HTMLResponse)
+def admin(request: Request):
+    # Preset tags stay outside the TTL cache so tag edits show up immediately
+    admin_data = dict(_get_admin_data())
+    admin_data["preset_tags"] = get_preset_tags()
+
     return templates.TemplateResponse("admin.html", {"request": request, "admin": admin_data})
 
 @app.post("/api/admin/tags")
@@ -467,14 +566,16 @@ def delete_preset_tag(tag_value: str):
 
 @app.get("/tickets/{ticket_id}", response_class=HTMLResponse)
 def ticket_detail(request: Request, ticket_id: str, db: Session = Depends(get_db)):
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    tid = _parse_ticket_id(ticket_id)
+    ticket = db.query(Ticket).filter(Ticket.id == tid).first() if tid else None
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     return templates.TemplateResponse("detail.html", {"request": request, "ticket": ticket})
 
 @app.post("/tickets/{ticket_id}/delete")
 def delete_ticket(request: Request, ticket_id: str, db: Session = Depends(get_db)):
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    tid = _parse_ticket_id(ticket_id)
+    ticket = db.query(Ticket).filter(Ticket.id == tid).first() if tid else None
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
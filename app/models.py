@@ -1,6 +1,6 @@
 from datetime import datetime
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Integer, DateTime, Text, Enum
+from sqlalchemy import String, Integer, SmallInteger, DateTime, Text, TypeDecorator, Uuid
 from typing import Optional
 import enum
 import uuid
@@ -10,15 +10,43 @@ class Base(DeclarativeBase): pass
 class Urgency(str, enum.Enum):
     none = "none"; low = "low"; normal = "normal"; high = "high"; critical = "critical"
 
+class UrgencyType(TypeDecorator):
+    """Store Urgency as a tiny int (1 byte) instead of a VARCHAR enum"""
+    impl = SmallInteger
+    cache_ok = True
+
+    _to_int = {Urgency.none: 0, Urgency.low: 1, Urgency.normal: 2, Urgency.high: 3, Urgency.critical: 4}
+    _to_enum = {v: k for k, v in _to_int.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, Urgency):
+            value = Urgency(value)
+        return self._to_int[value]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # Legacy VARCHAR column (pre-int-encoding databases): holds the
+            # enum's string value, or a numeric string once
+            # migrations/upgrade_sqlite.py has converted it - the old
+            # column's TEXT affinity keeps even the codes as text
+            if value.isdigit():
+                return self._to_enum[int(value)]
+            return Urgency(value)
+        return self._to_enum[value]
+
 class Ticket(Base):
     __tablename__ = "tickets"
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)  # CHAR(32) hex on SQLite, not a 36-char dashed string
     title: Mapped[str] = mapped_column(String(200))
     body: Mapped[str] = mapped_column(Text())
-    urgency: Mapped[Urgency] = mapped_column(Enum(Urgency), default=Urgency.normal)
+    urgency: Mapped[Urgency] = mapped_column(UrgencyType, default=Urgency.normal)
     due_date: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)  # ISO date YYYY-MM-DD
     status: Mapped[str] = mapped_column(String(16), default="printed")
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
     printed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     print_job_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     archive_pdf_path: Mapped[str] = mapped_column(Text())
@@ -1,5 +1,6 @@
 # app/printing.py
 from __future__ import annotations
+import functools
 import os
 import textwrap
 import logging
@@ -8,22 +9,44 @@ from typing import Optional
 
 from .storage import archive_paths
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Optional
 
-# Load environment variables from .env file
+# Render-path dependencies, imported once instead of per call. Pillow and
+# qrcode are only required for the ESC/POS bitmap path, so stay optional;
+# weasyprint stays lazy (heavy and platform-fragile).
 try:
-    from dotenv import load_dotenv
-    load_dotenv()
+    from PIL import Image, ImageDraw, ImageFont
 except ImportError:
-    pass  # dotenv not available, environment variables must be set externally
+    Image = ImageDraw = ImageFont = None
 
-# Configure logging for printing operations
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+try:
+    import qrcode
+except ImportError:
+    qrcode = None
+
+# numpy accelerates the final 1-bit threshold; Pillow-only path still works
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Load environment variables from .env file - once per process, not per
+# import (workers and tests import this module too)
+if not os.getenv("_DOTENV_LOADED"):
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass  # dotenv not available, environment variables must be set externally
+    os.environ["_DOTENV_LOADED"] = "1"
+
+# Library module: logging configuration is left to the application
 logger = logging.getLogger(__name__)
 
-PRINT_BACKEND = os.getenv("PRINT_BACKEND", "file").lower()
-logger.info(f"PRINT: Backend configuration: {PRINT_BACKEND}")
+# GS L: left margin = 0, then GS W: print area width = 576 (0x0240 LE) -
+# precomposed so edge-to-edge setup is one write to the printer
+_ESCPOS_EDGE_TO_EDGE = b"\x1D\x4C\x00\x00\x1D\x57\x40\x02"
 
 class PrintResult:
     def __init__(self, backend: str, pdf_path: Optional[Path] = None, job_id: Optional[str] = None):
@@ -38,12 +61,12 @@ def _escpos_connect():
     Connect to an ESC/POS printer - using your proven File method
     """
     device = os.getenv("ESCPOS_DEVICE", "/dev/usb/lp0")
-    logger.info(f"ESCPOS: Connecting to device: {device}")
+    logger.debug(f"ESCPOS: Connecting to device: {device}")
     
     try:
         from escpos.printer import File
         printer = File(device)
-        logger.info(f"ESCPOS: Successfully connected to {device}")
+        logger.debug(f"ESCPOS: Successfully connected to {device}")
         return printer
     except ImportError as e:
         logger.error(f"ESCPOS: Failed to import escpos library: {e}")
@@ -64,19 +87,31 @@ LABEL_PT = 16
 BODY_PT = 22
 SMALL_PT = 18
 
-def _load_font(size):
-    """Load DejaVu Sans with fallbacks - exact from approved format"""
-    from PIL import ImageFont
+def _find_font_path():
+    """Pick the first available candidate font path (scanned once per process)"""
     for path in [
         "DejaVuSans.ttf",
         "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
         "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
     ]:
         if os.path.exists(path):
-            try:
-                return ImageFont.truetype(path, size)
-            except Exception:
-                pass
+            return path
+    return None
+
+_FONT_PATH = _find_font_path()
+
+@functools.lru_cache(maxsize=32)
+def _load_font(size):
+    """Load DejaVu Sans with fallbacks - exact from approved format.
+
+    Cached per size: FreeType parsing the font file on every call was
+    the bulk of the render setup cost (5+ loads per ticket).
+    """
+    if _FONT_PATH:
+        try:
+            return ImageFont.truetype(_FONT_PATH, size)
+        except Exception:
+            pass
     return ImageFont.load_default()
 
 def _text_box(draw, s, font):
@@ -86,49 +121,100 @@ def _text_box(draw, s, font):
     w, h = draw.textsize(s, font=font)
     return (0,0,w,h)
 
+def _text_width(draw, s, font):
+    """Width-only measurement: font.getlength skips glyph rasterization
+    (Pillow >= 8.0); older Pillows fall back to the bbox path."""
+    if hasattr(font, "getlength"):
+        return int(font.getlength(s))
+    return _text_box(draw, s, font)[2]
+
+# Width cache for glyphs and short words, keyed by (id(font), s). Font ids
+# are stable because _load_font caches every font for the process lifetime.
+_GLYPH_W = {}
+
+def _cached_width(draw, s, font):
+    """Measured width of s, memoized for short strings (glyphs, words, labels)"""
+    if len(s) > 24:
+        return _text_width(draw, s, font)
+    key = (id(font), s)
+    w = _GLYPH_W.get(key)
+    if w is None:
+        if len(_GLYPH_W) > 4096:
+            _GLYPH_W.clear()
+        w = _GLYPH_W[key] = _text_width(draw, s, font)
+    return w
+
+def _split_overlong(draw, word, font, max_w):
+    """Hyphenate a word wider than max_w: jump to a cut point estimated from
+    the average glyph width, then adjust one character at a time until the
+    boundary is crossed. Returns (head, rest)."""
+    avg_w = max(1, _cached_width(draw, word, font) // len(word))
+    i = max(1, min(len(word) - 1, int(max_w // avg_w)))
+    w = _cached_width(draw, word[:i] + "-", font)
+    while w <= max_w and i < len(word) - 1:
+        nw = _cached_width(draw, word[:i+1] + "-", font)
+        if nw > max_w:
+            break
+        i += 1
+        w = nw
+    while w > max_w and i > 1:
+        i -= 1
+        w = _cached_width(draw, word[:i] + "-", font)
+    if w > max_w:
+        # If even one character + hyphen doesn't fit, just use the character
+        return word[:1], word[1:]
+    return word[:i] + "-", word[i:]
+
 def _wrap_lines(draw, text, font, max_w):
-    """Wrap text to fit width - improved word wrapping"""
+    """Wrap text to fit width - each word is measured once and line widths
+    accumulate, instead of remeasuring the whole trial line per word"""
     if not text or not text.strip():
         return [""]
-    
-    words = text.split()
-    lines, cur = [], []
-    def w(ws): return _text_box(draw, " ".join(ws), font)[2] if ws else 0
-    
-    for word in words:
+
+    space_w = _cached_width(draw, " ", font)
+    lines, cur, cur_w = [], [], 0
+
+    for word in text.split():
+        word_w = _cached_width(draw, word, font)
         # Handle very long single words by breaking them
-        while word and w([word]) > max_w:
-            # Find how many characters fit
-            for i in range(len(word)-1, 0, -1):
-                if w([word[:i] + "-"]) <= max_w:
-                    if cur:
-                        lines.append(" ".join(cur))
-                        cur = []
-                    lines.append(word[:i] + "-")
-                    word = word[i:]
-                    break
-            else:
-                # If even one character doesn't fit, just use it
-                if cur:
-                    lines.append(" ".join(cur))
-                    cur = []
-                lines.append(word[:1])
-                word = word[1:]
-        
+        while word and word_w > max_w:
+            head, word = _split_overlong(draw, word, font, max_w)
+            if cur:
+                lines.append(" ".join(cur))
+                cur, cur_w = [], 0
+            lines.append(head)
+            word_w = _cached_width(draw, word, font) if word else 0
+
         if word:  # If there's still word left
-            trial = cur + [word]
-            if not cur or w(trial) <= max_w:
-                cur = trial
+            trial_w = word_w if not cur else cur_w + space_w + word_w
+            if not cur or trial_w <= max_w:
+                cur.append(word)
+                cur_w = trial_w
             else:
-                if cur:
-                    lines.append(" ".join(cur))
-                cur = [word]
-    
-    if cur: 
+                lines.append(" ".join(cur))
+                cur, cur_w = [word], word_w
+
+    if cur:
         lines.append(" ".join(cur))
-    
+
     return lines if lines else [""]
 
+@functools.lru_cache(maxsize=1)
+def _measure_draw():
+    """Shared draw context for width queries only - never mutated, so one
+    instance serves every measurement. Built lazily since Pillow is optional."""
+    return ImageDraw.Draw(Image.new("L", (1, 1), 255))
+
+@functools.lru_cache(maxsize=512)
+def _wrap_lines_cached(text, font_size, max_w):
+    """Wrapped lines for (text, font size, max width), as a tuple.
+
+    The fixed chrome strings (due text, header, labels) repeat on every
+    ticket, so their layout cost drops to a cache hit. Measurement uses
+    the shared draw context - only widths are queried.
+    """
+    return tuple(_wrap_lines(_measure_draw(), text, _load_font(font_size), max_w))
+
 def _bolt_points(x, y, s):
     """Polygon points for a bolt - exact from approved format"""
     return [
@@ -174,32 +260,76 @@ def _draw_plus_badge(draw, x, y, w=40, h=40, filled=False):
     draw.rectangle([cx-1, y+pad, cx+1, y+h-pad], fill=bar_color)
     draw.rectangle([x+pad, cy-1, x+w-pad, cy+1], fill=bar_color)
 
-def _draw_bolts_row(draw, y, level, plus=False):
+# Templates get drawn with this inset so 3px-wide outlines aren't clipped
+# at the bitmap edge; pastes compensate by the same amount
+_TEMPLATE_PAD = 2
+
+@functools.lru_cache(maxsize=8)
+def _bolt_template(s, filled):
+    """Pre-rasterized bolt bitmap, built once per (size, fill) then pasted"""
+    img = Image.new("L", (s + _TEMPLATE_PAD * 2, int(s * 1.2) + _TEMPLATE_PAD * 2), 255)
+    _draw_bolt(ImageDraw.Draw(img), _TEMPLATE_PAD, _TEMPLATE_PAD, s, filled=filled)
+    return img
+
+@functools.lru_cache(maxsize=4)
+def _plus_badge_template(s, filled):
+    """Pre-rasterized + badge bitmap, built once per (size, fill) then pasted"""
+    img = Image.new("L", (s + _TEMPLATE_PAD * 2, s + _TEMPLATE_PAD * 2), 255)
+    _draw_plus_badge(ImageDraw.Draw(img), _TEMPLATE_PAD, _TEMPLATE_PAD, w=s, h=s, filled=filled)
+    return img
+
+def _draw_bolts_row(canvas, y, level, plus=False):
     """Three hollow bolts; fill first `level`; optional + badge at end - exact from approved format"""
     s = 48
     spacing = 20
     total_w = s*3 + spacing*2 + (s + spacing if True else 0)  # include space for plus badge
     start_x = (PAPER_DOTS - total_w) // 2
     for i in range(3):
-        _draw_bolt(draw, start_x + i*(s+spacing), y, s=s, filled=(i < max(0, min(3, level))))
+        bolt = _bolt_template(s, i < max(0, min(3, level)))
+        canvas.paste(bolt, (start_x + i*(s+spacing) - _TEMPLATE_PAD, y - _TEMPLATE_PAD))
     # plus badge
     px = start_x + 3*(s+spacing)
-    _draw_plus_badge(draw, px, y + int(s*0.10), w=s, h=s, filled=plus)
+    canvas.paste(_plus_badge_template(s, plus), (px - _TEMPLATE_PAD, y + int(s*0.10) - _TEMPLATE_PAD))
     return y + s + 6
 
-def _hr(draw, y, thick=2, inset=0):
+def _new_canvas(height):
+    """Allocate the render canvas, returning (image, array).
+
+    With numpy the Image wraps the array's buffer (mode L, contiguous), so
+    axis-aligned shapes can be written by slice assignment and ImageDraw
+    output lands in the same memory. Without numpy the array is None and
+    drawing falls back to Pillow primitives everywhere.
+    """
+    if np is not None:
+        arr = np.full((height, PAPER_DOTS), 255, dtype=np.uint8)
+        # frombuffer with the documented raw defaults shares memory for "L"
+        canvas = Image.frombuffer("L", (PAPER_DOTS, height), arr, "raw", "L", 0, 1)
+        canvas.readonly = 0
+        return canvas, arr
+    return Image.new("L", (PAPER_DOTS, height), 255), None
+
+def _hr(draw, y, thick=2, inset=0, arr=None):
     """Horizontal rule - exact from approved format"""
-    draw.rectangle([MARGIN_X+inset, y, PAPER_DOTS-MARGIN_X-inset, y+thick], fill=0)
+    if arr is not None:
+        arr[y:y+thick+1, MARGIN_X+inset:PAPER_DOTS-MARGIN_X-inset+1] = 0
+    else:
+        draw.rectangle([MARGIN_X+inset, y, PAPER_DOTS-MARGIN_X-inset, y+thick], fill=0)
 
 def _draw_wrapped(draw, text, font, y, left_x, right_x):
     """Draw wrapped text - exact from approved format"""
     max_w = right_x - left_x
-    for line in _wrap_lines(draw, text, font, max_w):
-        draw.text((left_x, y), line, fill=0, font=font)
-        y += int(font.size * 1.35)
+    lines = _wrap_lines_cached(text, font.size, max_w)
+    if lines:
+        # One multiline_text call per block instead of a draw.text per line
+        # saves the per-call FreeType setup on tall bodies
+        draw.multiline_text(
+            (left_x, y), "\n".join(lines),
+            font=font, fill=0, spacing=int(font.size * 0.35),
+        )
+        y += len(lines) * int(font.size * 1.35)
     return y
 
-def _draw_body(draw, y, body_text):
+def _draw_body(draw, y, body_text, arr=None):
     """Draw body with checkboxes - exact from approved format"""
     FONT_BODY = _load_font(BODY_PT)
     box = int(FONT_BODY.size * 0.78)
@@ -207,9 +337,17 @@ def _draw_body(draw, y, body_text):
     right_x = PAPER_DOTS - MARGIN_X
     for raw in body_text.splitlines():
         if raw.startswith("- "):
-            # checkbox
+            # checkbox - four slice writes when the numpy buffer is shared,
+            # matching rectangle(outline=0, width=2) drawn inward
             by = y + 3
-            draw.rectangle([left_x, by, left_x+box, by+box], outline=0, width=2)
+            if arr is not None:
+                x1, y1 = left_x + box, by + box
+                arr[by:by+2, left_x:x1+1] = 0
+                arr[y1-1:y1+1, left_x:x1+1] = 0
+                arr[by:y1+1, left_x:left_x+2] = 0
+                arr[by:y1+1, x1-1:x1+1] = 0
+            else:
+                draw.rectangle([left_x, by, left_x+box, by+box], outline=0, width=2)
             y = _draw_wrapped(draw, raw[2:].strip(), FONT_BODY, y, left_x + box + 10, right_x)
         elif raw.strip() == "":
             y += int(FONT_BODY.size * 0.6)
@@ -218,42 +356,49 @@ def _draw_body(draw, y, body_text):
     return y
 
 def _calculate_due_ranges(due_mode, due_date):
-    """Calculate explicit date ranges for due buckets - exact from patch brief"""
-    from datetime import date, timedelta
-    
+    """Calculate explicit date ranges for due buckets - exact from patch brief.
+
+    Keyed on today's ordinal so batch prints reuse one computed string per
+    bucket per day instead of redoing the weekday math and formatting.
+    """
+    return _due_ranges_cached(due_mode, due_date, date.today().toordinal())
+
+@functools.lru_cache(maxsize=32)
+def _due_ranges_cached(due_mode, due_date, today_ordinal):
+    today = date.fromordinal(today_ordinal)
     if due_mode == "THIS_WEEK":
-        today = date.today()
         start = today - timedelta(days=today.weekday())  # Monday of this week
         end = start + timedelta(days=6)  # Sunday of this week
-        return f"DUE: THIS WEEK\n{start.strftime('%a %b %d')} – {end.strftime('%a %b %d')}"
-    
+        return f"DUE: THIS WEEK\n{start:%a %b %d} – {end:%a %b %d}"
+
     elif due_mode == "NEXT_WEEK":
-        today = date.today()
         start = today - timedelta(days=today.weekday()) + timedelta(weeks=1)  # Monday of next week
         end = start + timedelta(days=6)  # Sunday of next week
-        return f"DUE: NEXT WEEK\n{start.strftime('%a %b %d')} – {end.strftime('%a %b %d')}"
-    
+        return f"DUE: NEXT WEEK\n{start:%a %b %d} – {end:%a %b %d}"
+
     elif due_mode == "THIS_MONTH":
-        today = date.today()
         start = today.replace(day=1)  # First day of month
         if start.month == 12:
             next_month = start.replace(year=start.year+1, month=1, day=1)
         else:
             next_month = start.replace(month=start.month+1, day=1)
         end = next_month - timedelta(days=1)  # Last day of month
-        return f"DUE: THIS MONTH\n{start.strftime('%Y-%m-%d')} – {end.strftime('%Y-%m-%d')}"
-    
+        return f"DUE: THIS MONTH\n{start:%Y-%m-%d} – {end:%Y-%m-%d}"
+
     elif due_mode == "DATE" and due_date:
-        return f"DUE: DATE: {due_date.strftime('%Y-%m-%d')}"
-    
+        return f"DUE: DATE: {due_date:%Y-%m-%d}"
+
     else:
         return "DUE: NONE"
 
+@functools.lru_cache(maxsize=256)
 def _make_qr(ticket_id, size=80):
-    """Generate QR code - exact from approved format"""
-    from PIL import Image, ImageDraw
+    """Generate QR code - exact from approved format.
+
+    Cached per (ticket_id, size): retries and reprints regenerate the same
+    code, and callers only paste the image, never mutate it.
+    """
     try:
-        import qrcode
         qr = qrcode.QRCode(border=1, box_size=2)
         qr.add_data(f"TICKET:{ticket_id}")
         qr.make(fit=True)
@@ -268,29 +413,80 @@ def _make_qr(ticket_id, size=80):
         d.text((6, size//2-6), ticket_id[:8], fill=0, font=font_small)
         return img
 
+_FALLBACK_CANVAS_H = 1400
+
+def _estimate_canvas_height(effective_title, body, due_text):
+    """Upper-bound guess of the rendered ticket height, from the same cached
+    line wrapping the drawing code uses plus the fixed chrome heights, so the
+    canvas can be allocated tight instead of a flat 1400 px."""
+    max_w = PAPER_DOTS - 2 * MARGIN_X
+    est = 8
+    est += int(LABEL_PT * 1.6)                       # header row
+    est += SMALL_PT + 8 + 6 + 8                      # ticket pill + padding
+    est += len(_wrap_lines_cached(effective_title, TITLE_PT, max_w)) * int(TITLE_PT * 1.35)
+    est += 4 + len(_wrap_lines_cached(due_text, SMALL_PT, max_w)) * int(SMALL_PT * 1.35)
+    est += 13                                        # hr + spacing
+    box = int(BODY_PT * 0.78)
+    line_h = int(BODY_PT * 1.35)
+    for raw in body.splitlines():
+        if raw.startswith("- "):
+            est += len(_wrap_lines_cached(raw[2:].strip(), BODY_PT, max_w - box - 10)) * line_h
+        elif raw.strip() == "":
+            est += int(BODY_PT * 0.6)
+        else:
+            est += len(_wrap_lines_cached(raw, BODY_PT, max_w)) * line_h
+    est += 6 + 13                                    # spacing + second hr
+    est += int(LABEL_PT * 1.5) + 80 + 10             # footer labels + QR
+    est += int(LABEL_PT * 1.2) + 48 + 6 + 8          # urgency label + bolts row
+    return est + 64                                  # slack for bbox variance
+
 def _render_adhd_ticket(ticket_id, title, body, urgency_level, urgency_plus, due_mode, due_date, author, tag):
     """Render ADHD ticket with exact approved format"""
-    from PIL import Image, ImageDraw
-    from datetime import date
-    
-    logger.info(f"ESCPOS: Rendering ADHD format for ticket {ticket_id}")
-    logger.info(f"ESCPOS: Config - PAPER_DOTS:{PAPER_DOTS}, MARGIN_X:{MARGIN_X}")
-    
+    logger.debug(f"ESCPOS: Rendering ADHD format for ticket {ticket_id}")
+    logger.debug(f"ESCPOS: Config - PAPER_DOTS:{PAPER_DOTS}, MARGIN_X:{MARGIN_X}")
+
+    effective_title = title if title else body.splitlines()[0][:50] if body else "Untitled Ticket"
+    due_text = _calculate_due_ranges(due_mode, due_date)
+
+    # Allocate the canvas close to the content height; most tickets need a
+    # few hundred px, not the 806 KB a fixed 576x1400 buffer costs
+    est_h = _estimate_canvas_height(effective_title, body, due_text)
+    canvas, arr = _new_canvas(est_h)
+    y = _draw_ticket(canvas, arr, ticket_id, effective_title, body, urgency_level, urgency_plus, due_text, author, tag)
+    if y > canvas.height:
+        # Estimate fell short (unusual font metrics) - redraw with room
+        logger.warning(f"ESCPOS: Height estimate {est_h}px too small (needed {y}px), re-rendering")
+        canvas, arr = _new_canvas(max(_FALLBACK_CANVAS_H, y + 50))
+        y = _draw_ticket(canvas, arr, ticket_id, effective_title, body, urgency_level, urgency_plus, due_text, author, tag)
+
+    # Crop to content and threshold to 1-bit. Receipts want a plain
+    # threshold, not Floyd-Steinberg; the numpy path slices and thresholds
+    # in one vectorized pass instead of Pillow's per-pixel dither loop.
+    used_h = max(y, 280)
+    if arr is not None:
+        bw = (arr[:used_h] >= 128).astype(np.uint8) * 255
+        ticket_bitmap = Image.fromarray(bw, mode="L").convert("1", dither=Image.NONE)
+    else:
+        ticket_bitmap = canvas.crop((0, 0, PAPER_DOTS, used_h)).convert("1", dither=Image.NONE)
+
+    logger.debug(f"ESCPOS: Generated ADHD bitmap ({PAPER_DOTS}x{used_h}px)")
+    return ticket_bitmap
+
+def _draw_ticket(canvas, arr, ticket_id, effective_title, body, urgency_level, urgency_plus, due_text, author, tag):
+    """Draw the ticket layout onto an allocated canvas; returns the used height"""
     # Load fonts
     FONT_TITLE = _load_font(TITLE_PT)
     FONT_LABEL = _load_font(LABEL_PT)
     FONT_BODY = _load_font(BODY_PT)
     FONT_SMALL = _load_font(SMALL_PT)
-    
-    # Create canvas
-    canvas = Image.new("L", (PAPER_DOTS, 1400), 255)
+
     draw = ImageDraw.Draw(canvas)
     y = 8
-    
+
     # Header row - exact from approved format
     draw.text((MARGIN_X, y), "⚡ ToDo Ticket", fill=0, font=FONT_LABEL)
     ds = date.today().isoformat()
-    ds_w = _text_box(draw, ds, FONT_LABEL)[2]
+    ds_w = _text_width(draw, ds, FONT_LABEL)
     draw.text((PAPER_DOTS - MARGIN_X - ds_w, y), ds, fill=0, font=FONT_LABEL)
     y += int(FONT_LABEL.size * 1.6)
     
@@ -306,27 +502,25 @@ def _render_adhd_ticket(ticket_id, title, body, urgency_level, urgency_plus, due
     y += (b-t) + pad_y*2 + 6
     
     # Title (WRAPPED) - much bigger and prominent
-    effective_title = title if title else body.splitlines()[0][:50] if body else "Untitled Ticket"
     y = _draw_wrapped(draw, effective_title, FONT_TITLE, y, MARGIN_X, PAPER_DOTS - MARGIN_X)
-    
+
     # DUE (single literal value with ranges; WRAPPED) - exact from patch brief
-    due_text = _calculate_due_ranges(due_mode, due_date)
     y += 4
     y = _draw_wrapped(draw, due_text, FONT_SMALL, y, MARGIN_X, PAPER_DOTS - MARGIN_X)
     
-    _hr(draw, y, thick=3); y += 10
-    
+    _hr(draw, y, thick=3, arr=arr); y += 10
+
     # Body (bullets + prose, fully wrapped) - exact from approved format
-    y = _draw_body(draw, y, body)
-    
+    y = _draw_body(draw, y, body, arr=arr)
+
     y += 6
-    _hr(draw, y, thick=3); y += 10
+    _hr(draw, y, thick=3, arr=arr); y += 10
     
     # Footer with QR code - exact from approved format + patch brief
     left = f"AUTHOR: {author or 'Unknown'}"
     right = f"TAG: {tag or 'None'}"
     draw.text((MARGIN_X, y), left, fill=0, font=FONT_LABEL)
-    rw = _text_box(draw, right, FONT_LABEL)[2]
+    rw = _text_width(draw, right, FONT_LABEL)
     draw.text((PAPER_DOTS - MARGIN_X - rw, y), right, fill=0, font=FONT_LABEL)
     
     # QR code bottom-left above footer rule
@@ -339,27 +533,22 @@ def _render_adhd_ticket(ticket_id, title, body, urgency_level, urgency_plus, due
     # URGENCY bolts at bottom for visual impact
     draw.text((MARGIN_X, y), "URGENCY", fill=0, font=FONT_LABEL)
     right_lbl = ["NONE","LOW","HIGH","CRITICAL"][max(0, min(3, urgency_level))]
-    rw = _text_box(draw, right_lbl, FONT_LABEL)[2]
+    rw = _text_width(draw, right_lbl, FONT_LABEL)
     draw.text((PAPER_DOTS - MARGIN_X - rw, y), right_lbl, fill=0, font=FONT_LABEL)
     y += int(FONT_LABEL.size * 1.2)
     
     # Bolts + plus at bottom for maximum visibility
-    y = _draw_bolts_row(draw, y, urgency_level, plus=urgency_plus)
+    y = _draw_bolts_row(canvas, y, urgency_level, plus=urgency_plus)
     y += 8  # Extra spacing at bottom
-    
-    # Crop to content
-    used_h = max(y, 280)
-    ticket_bitmap = canvas.crop((0, 0, PAPER_DOTS, used_h)).convert("1")
-    
-    logger.info(f"ESCPOS: Generated ADHD bitmap ({PAPER_DOTS}x{used_h}px)")
-    return ticket_bitmap
+
+    return y
 
 def _escpos_print_ticket(ticket, urgency_plus=False, tag=None, due_mode="NONE") -> PrintResult:
-    logger.info(f"ESCPOS: Starting print job for ticket {ticket.id}")
+    logger.debug(f"ESCPOS: Starting print job for ticket {ticket.id}")
     
     try:
         p = _escpos_connect()
-        logger.info("ESCPOS: Printer connection established")
+        logger.debug("ESCPOS: Printer connection established")
         
         try:
             # Map ticket data to expected format
@@ -368,7 +557,6 @@ def _escpos_print_ticket(ticket, urgency_plus=False, tag=None, due_mode="NONE")
             # Due date handling
             due_date_obj = None
             if due_mode == "DATE" and ticket.due_date:
-                from datetime import datetime
                 if isinstance(ticket.due_date, str):
                     try:
                         due_date_obj = datetime.fromisoformat(ticket.due_date).date()
@@ -376,9 +564,9 @@ def _escpos_print_ticket(ticket, urgency_plus=False, tag=None, due_mode="NONE")
                         pass
             
             # Render with exact approved format
-            logger.info("ESCPOS: Rendering ADHD ticket bitmap...")
+            logger.debug("ESCPOS: Rendering ADHD ticket bitmap...")
             ticket_bitmap = _render_adhd_ticket(
-                ticket_id=ticket.id[:8],
+                ticket_id=str(ticket.id)[:8],
                 title=ticket.title,
                 body=ticket.body,
                 urgency_level=urgency_level,
@@ -390,35 +578,33 @@ def _escpos_print_ticket(ticket, urgency_plus=False, tag=None, due_mode="NONE")
             )
             
             # Edge-to-edge printing setup - exact from approved format
-            logger.info("ESCPOS: Setting up edge-to-edge printing...")
+            logger.debug("ESCPOS: Setting up edge-to-edge printing...")
             try:
                 p.set(align="left")
-                # GS L: Set left margin = 0
-                p._raw(b"\x1D\x4C\x00\x00")
-                # GS W: Set print area width = 576 (0x0240 little-endian)
-                p._raw(b"\x1D\x57\x40\x02")
-                logger.info("ESCPOS: Edge-to-edge commands sent")
+                # Margin + print-area width in a single raw write
+                p._raw(_ESCPOS_EDGE_TO_EDGE)
+                logger.debug("ESCPOS: Edge-to-edge commands sent")
             except Exception as e:
                 logger.warning(f"ESCPOS: Edge-to-edge setup failed (safe to ignore): {e}")
             
             # Print bitmap - exact from approved format
-            logger.info("ESCPOS: Sending bitmap to printer...")
+            logger.debug("ESCPOS: Sending bitmap to printer...")
             try:
                 p.image(ticket_bitmap)
-                logger.info("ESCPOS: Bitmap sent via p.image()")
+                logger.debug("ESCPOS: Bitmap sent via p.image()")
             except Exception:
                 logger.warning("ESCPOS: p.image() failed, trying p.graphics() fallback...")
                 p.graphics(ticket_bitmap)
-                logger.info("ESCPOS: Bitmap sent via p.graphics()")
+                logger.debug("ESCPOS: Bitmap sent via p.graphics()")
             
             # Final spacing and cut
-            logger.info("ESCPOS: Adding final spacing and cut...")
+            logger.debug("ESCPOS: Adding final spacing and cut...")
             p.text("\n")
             p.cut()
-            logger.info("ESCPOS: Cut command sent successfully")
+            logger.debug("ESCPOS: Cut command sent successfully")
             
             result = PrintResult(backend="escpos", job_id=str(ticket.id))
-            logger.info(f"ESCPOS: Print job completed successfully for ticket {ticket.id}")
+            logger.debug(f"ESCPOS: Print job completed successfully for ticket {ticket.id}")
             return result
             
         except Exception as e:
@@ -426,9 +612,9 @@ def _escpos_print_ticket(ticket, urgency_plus=False, tag=None, due_mode="NONE")
             raise
         finally:
             try:
-                logger.info("ESCPOS: Closing printer connection...")
+                logger.debug("ESCPOS: Closing printer connection...")
                 p.close()
-                logger.info("ESCPOS: Printer connection closed")
+                logger.debug("ESCPOS: Printer connection closed")
             except Exception as e:
                 logger.warning(f"ESCPOS: Error closing printer connection: {e}")
                 
@@ -438,41 +624,48 @@ def _escpos_print_ticket(ticket, urgency_plus=False, tag=None, due_mode="NONE")
 
 # ---------- Public API ----------
 
-def print_ticket(ticket, html: str, output_dir: Optional[Path] = None, urgency_plus: bool = False, tag: Optional[str] = None, due_mode: str = "NONE") -> dict:
+def print_ticket(ticket, html: str, output_dir: Optional[Path] = None, urgency_plus: bool = False, tag: Optional[str] = None, due_mode: str = "NONE", output_pdf_path: Optional[Path] = None) -> dict:
     """
     Unified print entry point.
-    
+
     Args:
         ticket: Ticket model instance
         html: HTML content to print/render
         output_dir: Optional output directory (for file backend)
-        
+        output_pdf_path: Optional exact PDF target (for file backend); writing
+            straight to the archive location saves the caller a copy
+
     Returns:
         dict with keys: job_id (str|int|None), pdf_path (Path|None), backend (str)
     """
-    logger.info(f"PRINT: Starting print job for ticket {ticket.id} using backend '{PRINT_BACKEND}'")
-    
-    if PRINT_BACKEND == "file":
-        logger.info(f"PRINT: Using file backend for ticket {ticket.id}")
-        # Use output_dir or archive path
-        if output_dir:
+    # Read the backend per call so tests and workers can flip it without a
+    # module reload
+    backend = os.getenv("PRINT_BACKEND", "file").lower()
+    logger.debug(f"PRINT: Starting print job for ticket {ticket.id} using backend '{backend}'")
+
+    if backend == "file":
+        logger.debug(f"PRINT: Using file backend for ticket {ticket.id}")
+        # Use the explicit target, output_dir, or archive path
+        if output_pdf_path:
+            pdf_path = output_pdf_path
+        elif output_dir:
             pdf_path = output_dir / f"ticket-{ticket.id}.pdf"
         else:
-            archive_pdf, _ = archive_paths(ticket.id)
+            archive_pdf, _ = archive_paths(str(ticket.id))
             pdf_path = archive_pdf
-            
-        logger.info(f"PRINT: Target PDF path: {pdf_path}")
+
+        logger.debug(f"PRINT: Target PDF path: {pdf_path}")
         
         # Ensure directory exists
         pdf_path.parent.mkdir(parents=True, exist_ok=True)
-        logger.info(f"PRINT: Created directory: {pdf_path.parent}")
+        logger.debug(f"PRINT: Created directory: {pdf_path.parent}")
         
         # Try to generate PDF, but don't fail if WeasyPrint has issues (like on older Pi)
         try:
-            logger.info("PRINT: Attempting PDF generation with WeasyPrint...")
+            logger.debug("PRINT: Attempting PDF generation with WeasyPrint...")
             from weasyprint import HTML
             HTML(string=html, base_url=".").write_pdf(str(pdf_path))
-            logger.info(f"PRINT: PDF generated successfully: {pdf_path}")
+            logger.debug(f"PRINT: PDF generated successfully: {pdf_path}")
             return {
                 "job_id": None,
                 "pdf_path": pdf_path,
@@ -491,11 +684,11 @@ def print_ticket(ticket, html: str, output_dir: Optional[Path] = None, urgency_p
                 "backend": "file_no_pdf"
             }
 
-    elif PRINT_BACKEND == "escpos":
-        logger.info(f"PRINT: Using ESC/POS backend for ticket {ticket.id}")
+    elif backend == "escpos":
+        logger.debug(f"PRINT: Using ESC/POS backend for ticket {ticket.id}")
         try:
             result = _escpos_print_ticket(ticket, urgency_plus=urgency_plus, tag=tag, due_mode=due_mode)
-            logger.info(f"PRINT: ESC/POS print completed successfully for ticket {ticket.id}")
+            logger.debug(f"PRINT: ESC/POS print completed successfully for ticket {ticket.id}")
             return {
                 "job_id": result.job_id,
                 "pdf_path": None,
@@ -506,5 +699,5 @@ def print_ticket(ticket, html: str, output_dir: Optional[Path] = None, urgency_p
             raise
 
     else:
-        logger.error(f"PRINT: Unknown backend '{PRINT_BACKEND}' for ticket {ticket.id}")
-        raise ValueError(f"Unknown PRINT_BACKEND: {PRINT_BACKEND}")
+        logger.error(f"PRINT: Unknown backend '{backend}' for ticket {ticket.id}")
+        raise ValueError(f"Unknown PRINT_BACKEND: {backend}")
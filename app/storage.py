@@ -4,6 +4,13 @@ from typing import Tuple, Optional
 import json
 import hashlib
 import os
+import shutil
+
+# orjson encodes several times faster than stdlib json; fall back quietly
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 ARCHIVE_ROOT = Path("./archives")  # override with ENV/prod settings
 
@@ -14,9 +21,64 @@ def archive_paths(ticket_id: str) -> Tuple[Path, Path]:
     meta = base / "ticket.json"
     return pdf, meta
 
-def write_metadata(path: Path, data: dict) -> None:
+def write_metadata(path: Path, data: dict) -> bytes:
+    """Write archive metadata and return the serialized bytes (so callers
+    can hash them without re-reading the file)."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    # Compact output - nothing consumes the archive JSON interactively, and
+    # pretty-printing costs both serialization time and bytes on disk
+    if orjson is not None:
+        payload = orjson.dumps(data)
+    else:
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    path.write_bytes(payload)
+    return payload
+
+def fast_copy(src: Path, dst: Path, hasher=None) -> None:
+    """Copy src to dst, preferring kernel-side (zero-copy) mechanisms.
+
+    Tries os.copy_file_range (reflink/server-side copy on capable
+    filesystems), then os.sendfile, then a plain userspace copy with a
+    1 MiB buffer. File contents only - archive copies don't need the
+    source's timestamps or permissions.
+
+    With a hasher, the copy runs in userspace and feeds the hasher while
+    writing, so the data is read once for both copy and digest (the
+    kernel-side paths never surface the bytes to feed a hash).
+    """
+    if hasher is not None:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            for chunk in iter(lambda: fsrc.read(1024 * 1024), b''):
+                hasher.update(chunk)
+                fdst.write(chunk)
+        return
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        fd_in, fd_out = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(fd_in).st_size
+
+        for kernel_copy in (
+            (lambda count: os.copy_file_range(fd_in, fd_out, count)) if hasattr(os, "copy_file_range") else None,
+            (lambda count: os.sendfile(fd_out, fd_in, None, count)) if hasattr(os, "sendfile") else None,
+        ):
+            if kernel_copy is None:
+                continue
+            try:
+                copied = 0
+                while copied < size:
+                    sent = kernel_copy(size - copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+                if copied >= size:
+                    return
+            except OSError:
+                pass  # cross-device, pipe, or unsupported FS - try next strategy
+            os.lseek(fd_out, 0, os.SEEK_SET)
+            os.ftruncate(fd_out, 0)
+            fsrc.seek(0)
+
+        shutil.copyfileobj(fsrc, fdst, length=1024 * 1024)
 
 def output_pdf_path(job_name: str) -> Path:
     """Generate output path for non-archive PDFs (e.g., temp/preview files)"""
@@ -24,21 +86,26 @@ def output_pdf_path(job_name: str) -> Path:
     output_dir.mkdir(exist_ok=True)
     return output_dir / f"{job_name}.pdf"
 
+def update_hash_from_file(hasher, path: Path) -> None:
+    """Stream a file into an existing hasher in 1 MiB chunks"""
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(chunk)
+
 def compute_hash(pdf_path: Optional[Path], json_path: Path) -> str:
     """Compute SHA-256 hash of PDF and JSON files combined"""
     hasher = hashlib.sha256()
-    
-    # Hash PDF content if it exists
+
+    # Hash PDF content if it exists; streaming keeps memory bounded for
+    # multi-MB PDFs instead of slurping the whole file first
     if pdf_path and pdf_path.exists():
-        with open(pdf_path, 'rb') as f:
-            hasher.update(f.read())
+        update_hash_from_file(hasher, pdf_path)
     else:
         # If no PDF, hash a placeholder string
         hasher.update(b"NO_PDF_GENERATED")
-    
+
     # Hash JSON content
     if json_path.exists():
-        with open(json_path, 'rb') as f:
-            hasher.update(f.read())
-            
+        update_hash_from_file(hasher, json_path)
+
     return hasher.hexdigest()
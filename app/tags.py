@@ -9,6 +9,12 @@ from typing import List, Dict, Optional
 from pathlib import Path
 import logging
 
+# orjson parses faster than stdlib json; fall back quietly
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Default preset tags - can be overridden by config file
@@ -25,18 +31,35 @@ DEFAULT_PRESET_TAGS = [
 
 CONFIG_FILE = Path("app/config/tags.json")
 
+# Parsed-config cache keyed on the file's mtime; every UI render asks for
+# the preset tags, and they change rarely
+_CACHE = {"mtime": 0, "tags": None}
+
 def load_preset_tags() -> List[Dict[str, str]]:
-    """Load preset tags from config file, fallback to defaults."""
+    """Load preset tags from config file, fallback to defaults.
+
+    The parsed result is cached and reused until the config file's mtime
+    changes, so steady-state calls cost one stat instead of open+parse.
+    """
     try:
-        if CONFIG_FILE.exists():
-            with open(CONFIG_FILE, 'r') as f:
-                config = json.load(f)
-                preset_tags = config.get('preset_tags', DEFAULT_PRESET_TAGS)
-                logger.info(f"TAGS: Loaded {len(preset_tags)} preset tags from config")
-                return preset_tags
+        try:
+            mtime = CONFIG_FILE.stat().st_mtime
+        except FileNotFoundError:
+            mtime = 0
+        if _CACHE["tags"] is not None and _CACHE["mtime"] == mtime:
+            return _CACHE["tags"]
+
+        if mtime:
+            raw = CONFIG_FILE.read_bytes()
+            config = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            preset_tags = config.get('preset_tags', DEFAULT_PRESET_TAGS)
+            logger.debug(f"TAGS: Loaded {len(preset_tags)} preset tags from config")
         else:
-            logger.info(f"TAGS: Config file not found, using {len(DEFAULT_PRESET_TAGS)} default tags")
-            return DEFAULT_PRESET_TAGS
+            preset_tags = DEFAULT_PRESET_TAGS
+            logger.debug(f"TAGS: Config file not found, using {len(DEFAULT_PRESET_TAGS)} default tags")
+        _CACHE["mtime"] = mtime
+        _CACHE["tags"] = preset_tags
+        return preset_tags
     except Exception as e:
         logger.warning(f"TAGS: Error loading config, using defaults: {e}")
         return DEFAULT_PRESET_TAGS
@@ -58,17 +81,19 @@ def get_preset_tags() -> List[Dict[str, str]]:
     """Get current preset tags for UI rendering."""
     return load_preset_tags()
 
+_REQUIRED_TAG_KEYS = ('label', 'value', 'color')
+
 def validate_tag_config(tags: List[Dict[str, str]]) -> bool:
     """Validate tag configuration format."""
     if not isinstance(tags, list):
         return False
-    
+
     for tag in tags:
         if not isinstance(tag, dict):
             return False
-        if not all(key in tag for key in ['label', 'value', 'color']):
-            return False
-        if not all(isinstance(tag[key], str) for key in ['label', 'value', 'color']):
-            return False
-    
+        for key in _REQUIRED_TAG_KEYS:
+            # get + isinstance covers both presence and type in one lookup
+            if not isinstance(tag.get(key), str):
+                return False
+
     return True
\ No newline at end of file
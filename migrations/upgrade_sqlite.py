@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""In-place upgrade for SQLite databases created before the storage-format changes.
+
+Converts, in place:
+  * urgency VARCHAR values ('none'..'critical') to the SmallInteger codes
+    UrgencyType now expects
+  * dashed 36-char ticket ids to the 32-char hex form the Uuid type binds
+    (old rows are otherwise unreachable - lookups never match)
+  * adds the created_at index that create_all only builds for brand-new
+    databases
+
+Idempotent - rows already in the new format are untouched, so it is safe
+to run on every deploy before starting the app:
+
+    python migrations/upgrade_sqlite.py [path/to/tickets.db]
+
+Without an argument the path is taken from DATABASE_URL (same default as
+app/deps.py: sqlite:///./tickets.db).
+"""
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+SQLITE_PREFIX = "sqlite:///"
+
+
+def _db_path() -> Path:
+    if len(sys.argv) > 1:
+        return Path(sys.argv[1])
+    url = os.getenv("DATABASE_URL", "sqlite:///./tickets.db")
+    if not url.startswith(SQLITE_PREFIX):
+        sys.exit(f"Non-SQLite DATABASE_URL ({url!r}) - this script only upgrades SQLite databases")
+    return Path(url[len(SQLITE_PREFIX):])
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    # Legacy rows stored urgency as the enum's VARCHAR value; UrgencyType
+    # now binds/expects the integer codes
+    changed = conn.execute(
+        """
+        UPDATE tickets SET urgency = CASE urgency
+            WHEN 'none' THEN 0
+            WHEN 'low' THEN 1
+            WHEN 'normal' THEN 2
+            WHEN 'high' THEN 3
+            WHEN 'critical' THEN 4
+        END
+        WHERE urgency IN ('none', 'low', 'normal', 'high', 'critical')
+        """
+    ).rowcount
+    print(f"urgency: converted {changed} row(s) to integer codes")
+
+    # The Uuid type binds 32-char hex on SQLite; legacy rows stored the
+    # dashed 36-char form and would never match a lookup
+    changed = conn.execute(
+        "UPDATE tickets SET id = replace(id, '-', '') WHERE length(id) = 36"
+    ).rowcount
+    print(f"id: rewrote {changed} dashed id(s) as 32-char hex")
+
+    # index=True on the model only materializes through create_all, which
+    # skips tables that already exist; /history sorts on created_at
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tickets_created_at ON tickets (created_at)"
+    )
+    print("index: ensured ix_tickets_created_at")
+
+
+def main() -> None:
+    path = _db_path()
+    if not path.exists():
+        print(f"{path}: no database yet, nothing to upgrade")
+        return
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            upgrade(conn)
+    finally:
+        conn.close()
+    print(f"{path}: upgrade complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -42,7 +42,6 @@ EXCLUDES=(
   "--exclude" "__pycache__/"
   "--exclude" "*.pyc"
   "--exclude" "archives/"      # local archives; you can remove this if you want them synced
-  "--exclude" "migrations/"
 )
 
 rsync_push() {
@@ -90,6 +89,7 @@ run_server() {
   remote "tmux new-session -d -s todotickets \
     \"source '$PI_VENV/bin/activate' && \
      cd '$PI_APP_DIR' && \
+     python migrations/upgrade_sqlite.py && \
      python -c 'from app.deps import init_db; init_db()' && \
      uvicorn app.main:app --host 0.0.0.0 --port $UVICORN_PORT --reload\" || true"
   echo "Server started. Open: http://$PI_HOST:$UVICORN_PORT"